@@ -5,10 +5,9 @@ import logging
 import os
 import shutil
 import sys
+import time
 import typing as t
 from contextlib import ExitStack
-from datetime import datetime
-from datetime import timezone
 from weakref import WeakKeyDictionary
 
 import sqlalchemy as sa
@@ -100,28 +99,7 @@ class Alembic:
         else:
             self.engines = engines
 
-        # add logging handler if not configured
-        console_handler = logging.StreamHandler(sys.stderr)
-        console_handler.formatter = logging.Formatter(
-            fmt="%(levelname)-5.5s [%(name)s] %(message)s", datefmt="%H:%M:%S"
-        )
-
-        sqlalchemy_logger = logging.getLogger("sqlalchemy")
-        alembic_logger = logging.getLogger("alembic")
-
-        if not sqlalchemy_logger.hasHandlers():
-            sqlalchemy_logger.setLevel(logging.WARNING)
-            sqlalchemy_logger.addHandler(console_handler)
-
-        # alembic adds a null handler, remove it
-        if len(alembic_logger.handlers) == 1 and isinstance(
-            alembic_logger.handlers[0], logging.NullHandler
-        ):
-            alembic_logger.removeHandler(alembic_logger.handlers[0])
-
-        if not alembic_logger.hasHandlers():
-            alembic_logger.setLevel(logging.INFO)
-            alembic_logger.addHandler(console_handler)
+        _configure_logging()
 
         if app is not None:
             self.init_app(app)
@@ -199,7 +177,7 @@ class Alembic:
         .. versionchanged:: 3.0
             Uses the current UTC timestamp instead of a UUID.
         """
-        return str(int(datetime.now(timezone.utc).timestamp()))
+        return str(time.time_ns() // 1_000_000_000)
 
     @property
     def config(self) -> Config:
@@ -212,25 +190,22 @@ class Alembic:
             return cache.config
 
         cache.config = c = Config()
-        script_location = current_app.config["ALEMBIC"]["script_location"]
-
-        if not os.path.isabs(script_location) and ":" not in script_location:
-            script_location = os.path.join(current_app.root_path, script_location)
-
-        version_locations = [script_location]
-
-        for item in current_app.config["ALEMBIC"]["version_locations"]:
-            version_location = item if isinstance(item, str) else item[1]
-
-            if not os.path.isabs(version_location) and ":" not in version_location:
-                version_location = os.path.join(current_app.root_path, version_location)
-
-            version_locations.append(version_location)
+        alembic_config = current_app.config["ALEMBIC"]
+        root_path = current_app.root_path
+        script_location = _make_absolute(alembic_config["script_location"], root_path)
+        # Items are either a path, or a (branch, path) pair.
+        version_locations = [
+            script_location,
+            *(
+                _make_absolute(item if isinstance(item, str) else item[1], root_path)
+                for item in alembic_config["version_locations"]
+            ),
+        ]
 
         c.set_main_option("script_location", script_location)
         c.set_main_option("version_locations", ",".join(version_locations))
 
-        for key, value in current_app.config["ALEMBIC"].items():
+        for key, value in alembic_config.items():
             if key in ("script_location", "version_locations"):
                 continue
 
@@ -334,31 +309,37 @@ class Alembic:
         engines, metadatas = self._prepare_targets()
         env = self.environment_context
         config = current_app.config["ALEMBIC_CONTEXT"]
-        cache.contexts = {}
+        contexts: dict[str, MigrationContext] = {}
 
-        if len(metadatas) == 1:
-            env.configure(
-                connection=engines["default"].connect(),
-                target_metadata=metadatas["default"],
-                **config,
-            )
-            cache.contexts["default"] = env.get_context()
-        else:
-            for name in metadatas:
-                # Set the upgrade and downgrade tokens for each context.
+        # Close any connections that were opened if creating a later context
+        # fails. Otherwise, keep them open until the app context ends.
+        with ExitStack() as stack:
+            if len(metadatas) == 1:
                 env.configure(
-                    connection=engines[name].connect(),
-                    target_metadata=metadatas[name],
-                    upgrade_token=f"{name}_upgrades",
-                    downgrade_token=f"{name}_downgrades",
+                    connection=stack.enter_context(engines["default"].connect()),
+                    target_metadata=metadatas["default"],
                     **config,
                 )
-                cache.contexts[name] = env.get_context()
-                # The migration context is passed a reference to the env's
-                # context_ops dict. Copy and replace it so that the next
-                # context is isolated from this one.
-                env.context_opts = env.context_opts.copy()
-
+                contexts["default"] = env.get_context()
+            else:
+                for name in metadatas:
+                    # Set the upgrade and downgrade tokens for each context.
+                    env.configure(
+                        connection=stack.enter_context(engines[name].connect()),
+                        target_metadata=metadatas[name],
+                        upgrade_token=f"{name}_upgrades",
+                        downgrade_token=f"{name}_downgrades",
+                        **config,
+                    )
+                    contexts[name] = env.get_context()
+                    # The migration context is passed a reference to the env's
+                    # context_ops dict. Copy and replace it so that the next
+                    # context is isolated from this one.
+                    env.context_opts = env.context_opts.copy()
+
+            stack.pop_all()
+
+        cache.contexts = contexts
         return cache.contexts
 
     @property
@@ -383,11 +364,10 @@ class Alembic:
         if cache.ops is not None:
             return cache.ops
 
-        cache.ops = {}
-
-        for name, _context in self.migration_contexts.items():
-            cache.ops[name] = Operations(self.migration_context)
-
+        cache.ops = {
+            name: Operations(context)
+            for name, context in self.migration_contexts.items()
+        }
         return cache.ops
 
     @property
@@ -460,24 +440,25 @@ class Alembic:
         )
         template_dest = os.path.join(script_dir, "script.py.mako")
 
-        if not os.access(template_src, os.F_OK):
+        if not os.path.exists(template_src):
             raise util.CommandError(f"Template {template_src} does not exist")
 
-        if not os.access(script_dir, os.F_OK):
-            os.makedirs(script_dir)
+        os.makedirs(script_dir, exist_ok=True)
 
-        if not os.access(template_dest, os.F_OK):
-            shutil.copy(template_src, template_dest)
+        if not os.path.exists(template_dest):
+            shutil.copyfile(template_src, template_dest)
 
         for version_location in self.script_directory._version_locations:
-            if not os.access(version_location, os.F_OK):
-                os.makedirs(version_location)
+            os.makedirs(version_location, exist_ok=True)
 
     def current(self) -> tuple[Script, ...]:
         """Get the list of current revisions."""
-        return self.script_directory.get_revisions(
-            self.migration_context.get_current_heads()
-        )
+        heads = self.migration_context.get_current_heads()
+
+        if not heads:
+            return ()
+
+        return self.script_directory.get_revisions(heads)
 
     def heads(self, resolve_dependencies: bool = False) -> tuple[Script, ...]:
         """Get the list of revisions that have no child revisions.
@@ -661,8 +642,8 @@ class Alembic:
             path = self.script_directory.dir
 
         # relative path is relative to app root
-        if path and not os.path.isabs(path) and ":" not in path:
-            path = os.path.join(current_app.root_path, path)
+        if path:
+            path = _make_absolute(path, current_app.root_path)
 
         revision_context = autogenerate.RevisionContext(
             self.config,
@@ -727,22 +708,22 @@ class Alembic:
         """Generate the :class:`~alembic.operations.ops.MigrationScript`
         object that would generate a new revision.
         """
-        scripts = []
+        contexts = self.migration_contexts
 
-        for context in self.migration_contexts.values():
-            scripts.append(
-                autogenerate.produce_migrations(
-                    context, context.opts["target_metadata"]
-                )
+        if len(contexts) == 1:
+            context = contexts["default"]
+            return autogenerate.produce_migrations(
+                context, context.opts["target_metadata"]
             )
 
+        scripts = [
+            autogenerate.produce_migrations(context, context.opts["target_metadata"])
+            for context in contexts.values()
+        ]
+        # Combine the ops for each database into one script.
         script = scripts[0]
-
-        if len(scripts) > 1:
-            # Combine the ops for each database into one script.
-            script.upgrade_ops = [s.upgrade_ops for s in scripts]  # type: ignore[assignment]
-            script.downgrade_ops = [s.downgrade_ops for s in scripts]  # type: ignore[assignment]
-
+        script.upgrade_ops = [s.upgrade_ops for s in scripts]  # type: ignore[assignment]
+        script.downgrade_ops = [s.downgrade_ops for s in scripts]  # type: ignore[assignment]
         return script
 
     def compare_metadata(self) -> list[tuple[t.Any, ...]]:
@@ -762,6 +743,49 @@ class Alembic:
         return script.upgrade_ops.as_diffs()  # type: ignore[no-any-return]
 
 
+def _configure_logging() -> None:
+    """Add a ``stderr`` handler to the ``sqlalchemy`` and ``alembic`` loggers if
+    logging is not already configured for them.
+    """
+    sqlalchemy_logger = logging.getLogger("sqlalchemy")
+    alembic_logger = logging.getLogger("alembic")
+
+    # alembic adds a null handler, remove it
+    if len(alembic_logger.handlers) == 1 and isinstance(
+        alembic_logger.handlers[0], logging.NullHandler
+    ):
+        alembic_logger.removeHandler(alembic_logger.handlers[0])
+
+    configure_sqlalchemy = not sqlalchemy_logger.hasHandlers()
+    configure_alembic = not alembic_logger.hasHandlers()
+
+    if not (configure_sqlalchemy or configure_alembic):
+        return
+
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.formatter = logging.Formatter(
+        fmt="%(levelname)-5.5s [%(name)s] %(message)s", datefmt="%H:%M:%S"
+    )
+
+    if configure_sqlalchemy:
+        sqlalchemy_logger.setLevel(logging.WARNING)
+        sqlalchemy_logger.addHandler(console_handler)
+
+    if configure_alembic:
+        alembic_logger.setLevel(logging.INFO)
+        alembic_logger.addHandler(console_handler)
+
+
+def _make_absolute(path: str, root: str) -> str:
+    """Join a relative path to the app's root path. Absolute paths, and package
+    resource paths containing ``:``, are returned unchanged.
+    """
+    if os.path.isabs(path) or ":" in path:
+        return path
+
+    return os.path.join(root, path)
+
+
 @dataclasses.dataclass
 class _Cache:
     """Cached Alembic objects for a given Flask app."""
@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-import os
-from pathlib import Path
-
 import pytest
 from flask import Flask
 from flask_sqlalchemy_lite import SQLAlchemy
@@ -12,20 +9,6 @@ from sqlalchemy.orm import DeclarativeBase
 from flask_alembic import Alembic
 
 
-@pytest.fixture
-def app(app: Flask) -> Flask:
-    app.config["SQLALCHEMY_ENGINES"] = {
-        "default": "sqlite://",
-        "other": "sqlite://",
-    }
-    return app
-
-
-@pytest.fixture
-def db(app: Flask) -> SQLAlchemy:
-    return SQLAlchemy(app)
-
-
 class Model(DeclarativeBase):
     pass
 
@@ -47,7 +30,7 @@ def test_metadata_required(app: Flask) -> None:
 def test_uses_engines(app: Flask) -> None:
     """Engines from Flask-SQLAlchemy-Lite are used if none are passed."""
     alembic = Alembic(app, metadatas=Model.metadata)
-    assert alembic.migration_context
+    assert alembic.migration_context is not None
 
 
 @pytest.mark.usefixtures("app_ctx")
@@ -73,10 +56,9 @@ def test_missing_engine(app: Flask) -> None:
 
 
 @pytest.mark.usefixtures("app_ctx", "db")
-def test_override_engines(tmp_path: Path, app: Flask) -> None:
+def test_override_engines(app: Flask) -> None:
     """A passed engine overrides one from Flask-SQLAlchemy-Lite."""
-    db_path = os.fspath(tmp_path / "default.sqlite")
-    engine = create_engine(f"sqlite:///{db_path}")
+    engine = create_engine("sqlite://")
     alembic = Alembic(app, metadatas=Model.metadata, engines=engine)
     assert alembic.migration_context.connection is not None
-    assert alembic.migration_context.connection.engine.url.database == db_path
+    assert alembic.migration_context.connection.engine is engine
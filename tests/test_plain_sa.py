@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import os
+from pathlib import Path
+
 import pytest
 from flask import Flask
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import DeclarativeBase
 
 from flask_alembic import Alembic
@@ -47,6 +51,22 @@ def test_valid_config(app: Flask) -> None:
     assert len(alembic.migration_contexts) == 2
 
 
+@pytest.mark.usefixtures("app_ctx")
+def test_ops_per_context(app: Flask) -> None:
+    """Each database gets operations for its own migration context."""
+    alembic = Alembic(
+        app,
+        metadatas={"default": Model.metadata, "other": Other.metadata},
+        engines={
+            "default": create_engine("sqlite://"),
+            "other": create_engine("sqlite://"),
+        },
+    )
+
+    for name, context in alembic.migration_contexts.items():
+        assert alembic.ops[name].migration_context is context
+
+
 @pytest.mark.usefixtures("app_ctx")
 def test_missing_engine(app: Flask) -> None:
     """A valid config that creates two migration contexts."""
@@ -59,3 +79,25 @@ def test_missing_engine(app: Flask) -> None:
 
     with pytest.raises(RuntimeError, match="Missing engine config"):
         assert alembic.migration_context
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_context_error_closes_connections(tmp_path: Path, app: Flask) -> None:
+    """If connecting to one engine fails, connections already opened for other
+    engines are closed and no partial contexts are cached.
+    """
+    engine = create_engine(f"sqlite:///{os.fspath(tmp_path / 'default.sqlite')}")
+    bad_engine = create_engine(f"sqlite:///{os.fspath(tmp_path / 'bad' / 'x.db')}")
+    alembic = Alembic(
+        app,
+        metadatas={"default": Model.metadata, "other": Other.metadata},
+        engines={"default": engine, "other": bad_engine},
+    )
+
+    with pytest.raises(OperationalError):
+        assert alembic.migration_contexts
+
+    assert engine.pool.checkedout() == 0  # type: ignore[attr-defined]
+
+    with pytest.raises(OperationalError):
+        assert alembic.migration_contexts